@@ -1,12 +1,14 @@
 from copy import deepcopy
 from functools import lru_cache
 from glob import glob
+from heapq import nlargest
 import json
 import os.path
 import re
 
-from jsonschema import draft7_format_checker
-from jsonschema.validators import RefResolver, validator_for
+import fastjsonschema
+import orjson
+from rfc3339_validator import validate_rfc3339
 
 
 uuid_re = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
@@ -35,57 +37,89 @@ def _get_schema_store() -> dict:
     return _schema_store
 
 
-# grab a reference to the checker draft7_format_checker is using by default
-_is_datetime, _is_datetime_raises = draft7_format_checker.checkers["date-time"]
-
-
-# this could be considered monkeypatching, could perhaps use a deepcopy to mitigate that...
-@draft7_format_checker.checks("date-time", raises=_is_datetime_raises)
-def _lenient_is_datetime(instance):
+def _lenient_is_datetime(instance: str) -> bool:
     """
-    A more lenient version of jsonschema's is_datetime checker needed because CKAN's
+    A more lenient version of the usual rfc3339 date-time check needed because CKAN's
     timestamps aren't completely rfc3339 compliant. if a string first fails to validate
     alone, see if appending a "Z" allows it to pass
     """
-    return _is_datetime(instance) or (
-        isinstance(instance, str) and _is_datetime(instance + "Z")
-    )
+    return validate_rfc3339(instance) or validate_rfc3339(instance + "Z")
 
 
-# jsonschema doesn't currently validate uuids
-@draft7_format_checker.checks("uuid")
-def _is_uuid(instance):
-    return bool(isinstance(instance, str) and uuid_re.fullmatch(instance))
+def _is_uuid(instance: str) -> bool:
+    return bool(uuid_re.fullmatch(instance))
 
 
-@lru_cache()
+# unbounded cache: there are only ever as many entries as schema files, and evicting one
+# would force a needless recompilation on the next validation. fastjsonschema generates
+# python code for the schema once here, making the validation calls themselves cheap
+@lru_cache(maxsize=None)
 def get_validator(schema_name: str):
     store = _get_schema_store()
-    schema = store[_schema_id_base + schema_name]
-    return validator_for(schema)(
-        schema,
-        resolver=RefResolver("", schema, store),
-        format_checker=draft7_format_checker,
+    return fastjsonschema.compile(
+        store[_schema_id_base + schema_name],
+        handlers={"http": lambda uri: store[uri]},
+        formats={
+            "date-time": _lenient_is_datetime,
+            "uuid": _is_uuid,
+        },
     )
 
 
-def validate_against_schema(candidate, schema_name: str) -> None:
-    get_validator(schema_name).validate(candidate)
+# how many leading elements of each array to keep when validating a sampled instance
+_sample_array_limit = 5
+
+
+def _truncate_long_arrays(obj, limit: int):
+    if isinstance(obj, dict):
+        return {k: _truncate_long_arrays(v, limit) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_truncate_long_arrays(element, limit) for element in obj[:limit]]
+    else:
+        return obj
+
+
+def validate_against_schema(candidate, schema_name: str, sample_arrays: bool = False) -> None:
+    """
+    Validate candidate against the named schema. With sample_arrays set, only the first
+    few elements of each array are validated - acceptable for smoke-checking huge
+    responses whose elements all take the same shape, where walking every one of e.g.
+    1000 results buys little extra assurance
+    """
+    if sample_arrays:
+        candidate = _truncate_long_arrays(candidate, _sample_array_limit)
+    get_validator(schema_name)(candidate)
+
+
+def parse_response_json(response):
+    """
+    decode a response body with orjson, which parses the utf-8 bytes directly instead of
+    going via an intermediate str - worth using over response.json() for the multi-
+    megabyte bodies the rows=1000 requests can return
+    """
+    return orjson.loads(response.content)
 
 
 _all_alpha_re = re.compile(r"[a-z]+", re.I)
 
 
-def extract_search_terms(source_text: str, n: int) -> str:
+@lru_cache(maxsize=256)
+def extract_search_terms(source_text: str, n: int) -> tuple:
     """
     choose n longest "clean" words from the source_text as our search terms (longer words
-    are more likely to be distinctive) and format them for use in a url
+    are more likely to be distinctive), returned as a tuple - url-encoding them is the
+    http client's job
+
+    memoized: the same package (and so the same source_text) can be drawn several times
+    in one session, and re-tokenizing a long notes field each time is wasted work
     """
-    return "+".join(sorted(
+    # nlargest rather than a full sort: we only ever want a handful of terms from what
+    # can be hundreds of tokens
+    return tuple(nlargest(
+        n,
         (token for token in source_text.split() if _all_alpha_re.fullmatch(token)),
-        key=lambda t: len(t),
-        reverse=True,
-    )[:n])
+        key=len,
+    ))
 
 
 @lru_cache()
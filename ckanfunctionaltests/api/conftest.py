@@ -1,27 +1,61 @@
+import asyncio
 from collections.abc import Mapping, Sequence
+from copy import deepcopy
 from functools import wraps
 import json
+import os
 from random import Random
 
+import httpx
 import pytest
-import requests
 
 
-from ckanfunctionaltests.api import get_example_response, uuid_re
+from ckanfunctionaltests.api import get_example_response, parse_response_json, uuid_re
 
 
-# we will want to be able to seed this at some point
-_random = Random()
+def pytest_collection_modifyitems(items):
+    # run tests marked "slow" first: a long-tailed test kicked off at the end of a
+    # worker's queue extends the whole run, whereas started early it overlaps with
+    # everything else. sort() being stable, the rest keep their collected order.
+    items.sort(key=lambda item: 0 if item.get_closest_marker("slow") else 1)
 
 
-@pytest.fixture()
+# we will want to be able to seed this at some point. each xdist worker is a separate
+# process so gets its own instance, but mix the worker id into the seed to guarantee
+# workers can't end up making identical "random" choices
+_random = Random(
+    os.urandom(16) + os.environ.get("PYTEST_XDIST_WORKER", "").encode()
+)
+
+
+@pytest.fixture(scope="session")
 def rsession(variables):
-    with requests.Session() as session:
-        session.headers = {"user-agent": variables["api_user_agent"]}
+    # session-scoped so each worker keeps one connection pool for its whole run. an httpx
+    # Client rather than a requests Session: with http2 enabled, requests multiplex over
+    # a small bounded set of connections instead of serializing one per socket
+    with httpx.Client(
+        http2=True,
+        headers={"user-agent": variables["api_user_agent"]},
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        timeout=30,
+    ) as session:
         yield session
 
 
 @pytest.fixture()
+async def ahttpx(variables):
+    """
+    An async counterpart to rsession, allowing a test to issue its independent requests
+    concurrently (via e.g. asyncio.gather) instead of paying for each round trip in turn
+    """
+    async with httpx.AsyncClient(
+        http2=True,
+        headers={"user-agent": variables["api_user_agent"]},
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
 def base_url(variables):
     return variables["api_base_url"]
 
@@ -32,9 +66,21 @@ def base_url_3(request, base_url):
     return base_url + request.param
 
 
+@pytest.fixture()
+def limit_offset_params(base_url_3, variables):
+    """
+    The pagination parameter names appropriate for the endpoint variant base_url_3
+    points at. (can't be session-scoped while base_url_3 is a parametrized
+    function-scoped fixture, but it saves each test re-deriving the branch inline)
+    """
+    return ("rows", "start",) if base_url_3.endswith("/3") or variables.get("ckan_version") == "2.9"\
+        else ("limit", "offset",)
+
+
 def get_dataset_search_json_response(response, base_url_3, variables=None):
-    return response.json().get('result') if variables.get('ckan_version') == '2.9' and base_url_3.endswith("/3")\
-        else response.json()
+    rj = parse_response_json(response)
+    return rj.get('result') if variables.get('ckan_version') == '2.9' and base_url_3.endswith("/3")\
+        else rj
 
 
 
@@ -72,33 +118,71 @@ def random_org_slug(base_url, rsession):
     return _random.choice(response.json()["result"])
 
 
-@pytest.fixture()
-def random_pkg_slug(base_url, rsession):
-    # make do with one of the first 200 because the full list is big & slow
+# how many packages to prefetch for the random_pkg pool - enough that tests drawing from
+# it in one session still see some variety
+_pkg_pool_size = 32
+
+
+@pytest.fixture(scope="session")
+def package_list_response(base_url, rsession):
+    """
+    A package_list response fetched once per session (per worker), shared by anything
+    needing a selection of package names. truncated to the first 200 because the full
+    list is big & slow - tests exercising the endpoint itself still issue their own
+    requests
+    """
     response = rsession.get(f"{base_url}/action/package_list?limit=200")
     assert response.status_code == 200
+    return response.json()
 
+
+@pytest.fixture(scope="session")
+def random_pkg_pool(variables, base_url, rsession, package_list_response):
+    """
+    A pool of packages prefetched in one concurrent batch, once per session (per worker),
+    for random_pkg/random_pkg_slug to draw from - saving every consuming test its own
+    package_list & package_show round trips
+    """
     suitable_names = tuple(
-        name for name in response.json()["result"] if not uuid_re.fullmatch(name) and not 'harvest' in name
+        name for name in package_list_response["result"] if not uuid_re.fullmatch(name) and not 'harvest' in name
     )
 
     if not suitable_names:
         raise ValueError("No suitable package slugs found")
 
-    return _random.choice(suitable_names)
+    slugs = _random.sample(suitable_names, min(_pkg_pool_size, len(suitable_names)))
+
+    async def _fetch_all():
+        async with httpx.AsyncClient(
+            http2=True,
+            headers={"user-agent": variables["api_user_agent"]},
+        ) as client:
+            return await asyncio.gather(*(
+                client.get(f"{base_url}/action/package_show?id={slug}") for slug in slugs
+            ))
+
+    pool = []
+    for ps_response in asyncio.run(_fetch_all()):
+        assert ps_response.status_code == 200
+        pool.append(ps_response.json()["result"])
+
+    return pool
 
 
 @pytest.fixture()
-def stable_pkg_slug():
-    return "example-dataset-number-one"
+def random_pkg(random_pkg_pool):
+    # a deepcopy allows the test to mutate the package safely without affecting the pool
+    return deepcopy(_random.choice(random_pkg_pool))
 
 
 @pytest.fixture()
-def random_pkg(base_url, rsession, random_pkg_slug):
-    response = rsession.get(f"{base_url}/action/package_show?id={random_pkg_slug}")
-    assert response.status_code == 200
+def random_pkg_slug(random_pkg):
+    return random_pkg["name"]
+
 
-    return response.json()["result"]
+@pytest.fixture()
+def stable_pkg_slug():
+    return "example-dataset-number-one"
 
 
 @pytest.fixture()
@@ -1,7 +1,7 @@
 import json
 import os.path
 
-import jsonschema
+import fastjsonschema
 import pytest
 
 from ckanfunctionaltests.api import validate_against_schema, get_example_response
@@ -32,7 +32,7 @@ def test_package_list_must_be_slugs(nonslug_value):
     example_response = get_example_response("package_list.json")
     example_response["result"][2] = nonslug_value
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_list")
 
 
@@ -42,7 +42,7 @@ def test_package_show_org_must_follow_org_schema():
     # note non-existent leap-day
     example_response["result"]["organization"]["created"] = "2019-02-29T16:00:00.123Z"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_show")
 
 
@@ -51,7 +51,7 @@ def test_organization_show_is_organization():
 
     example_response["result"]["is_organization"] = False
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "organization_show")
 
 
@@ -64,7 +64,7 @@ def test_missing_ids(endpoint):
 
     del example_response["result"]["id"]
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, endpoint)
 
 
@@ -77,7 +77,7 @@ def test_unknown_state(endpoint):
 
     example_response["result"]["state"] = "lockdown"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, endpoint)
 
 
@@ -93,7 +93,7 @@ def test_missing_success(endpoint):
 
     del example_response["success"]
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, endpoint)
 
 
@@ -102,7 +102,7 @@ def test_package_search_noninteger_facet():
 
     example_response["result"]["facets"]["organization"]["natural-england"] = "2"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_search")
 
 
@@ -111,7 +111,7 @@ def test_package_search_empty_tag():
 
     example_response["result"]["results"][2]["tags"].append({})
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_search")
 
 
@@ -120,7 +120,7 @@ def test_package_search_pii_field():
 
     example_response["result"]["results"][1]["author"] = "Rieux"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_search")
 
 
@@ -129,7 +129,7 @@ def test_package_search_pii_extra():
 
     example_response["result"]["results"][1]["extras"].append({"key": "author", "value": "Rieux"})
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "package_search")
 
 
@@ -138,7 +138,7 @@ def test_search_dataset_pii_field():
 
     example_response["results"][1]["author"] = "Rieux"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "search_dataset")
 
 
@@ -147,7 +147,7 @@ def test_search_dataset_pii_extra():
 
     example_response["results"][1]["extras"]["author"] = "Rieux"
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "search_dataset")
 
 
@@ -156,10 +156,31 @@ def test_format_autocomplete_result_missing_format():
 
     del example_response["ResultSet"]["Result"][1]["Format"]
 
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(example_response, "format_autocomplete")
 
 
 def test_i18n_non_dict():
-    with pytest.raises(jsonschema.ValidationError):
+    with pytest.raises(fastjsonschema.JsonSchemaException):
         validate_against_schema(3.1415, "i18n")
+
+
+def test_sample_arrays_only_validates_leading_elements():
+    example_response = get_example_response("package_list.json")
+    # put a bad entry beyond the sampled leading elements
+    example_response["result"] = [f"some-dataset-{i}" for i in range(9)] + [123]
+
+    # a full validation catches it...
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate_against_schema(example_response, "package_list")
+
+    # ...but a sampled one never looks that deep
+    validate_against_schema(example_response, "package_list", sample_arrays=True)
+
+
+def test_sample_arrays_still_validates_leading_elements():
+    example_response = get_example_response("package_list.json")
+    example_response["result"][2] = 123
+
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate_against_schema(example_response, "package_list", sample_arrays=True)
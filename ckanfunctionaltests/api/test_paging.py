@@ -12,7 +12,9 @@ import pytest
 def test_list_paging_equivalence(subtests, base_url_3, rsession, endpoint_path):
     full_response = rsession.get(f"{base_url_3}{endpoint_path}")
     assert full_response.status_code == 200
-    assert full_response.json()["success"] is True
+    # decode each response once - these bodies can be big enough that re-parsing shows
+    frj = full_response.json()
+    assert frj["success"] is True
 
     accumulated_results = []
     for log_limit in count():
@@ -45,15 +47,16 @@ def test_list_paging_equivalence(subtests, base_url_3, rsession, endpoint_path):
             break
 
     with subtests.test("accumulated results equal"):
-        assert accumulated_results == full_response.json()["result"]
+        assert accumulated_results == frj["result"]
 
     with subtests.test("no results past end"):
         overrun_response = rsession.get(
             f"{base_url_3}{endpoint_path}&limit={limit}&offset={len(accumulated_results)+10}"
         )
         assert overrun_response.status_code == 200
-        assert overrun_response.json()["success"] is True
-        assert overrun_response.json()["result"] == []
+        orj = overrun_response.json()
+        assert orj["success"] is True
+        assert orj["result"] == []
 
 
 @pytest.mark.parametrize("endpoint_path,results_getter,count_getter,limit_param,offset_param", (
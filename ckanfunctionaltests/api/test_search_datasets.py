@@ -3,16 +3,11 @@ from warnings import warn
 
 import pytest
 
-from ckanfunctionaltests.api import validate_against_schema, extract_search_terms
+from ckanfunctionaltests.api import validate_against_schema
 from ckanfunctionaltests.api.comparisons import AnySupersetOf
 from ckanfunctionaltests.api.conftest import clean_unstable_elements, get_dataset_search_json_response
 
 
-def _get_limit_offset_params(base_url, variables={}):
-    return ("rows", "start",) if base_url.endswith("/3") or variables.get("ckan_version") == "2.9"\
-        else ("limit", "offset",)
-
-
 def _validate_embedded_keys(response_json):
     for result in response_json["results"]:
         for key in ("data_dict", "validated_data_dict",):
@@ -23,102 +18,52 @@ def _validate_embedded_keys(response_json):
                 validate_against_schema(inner_package, "package_base")
 
 
+# the three fl variants previously lived as separate near-identical tests issuing
+# near-identical requests - parametrizing them keeps the coverage of each response shape
+# while letting xdist schedule them independently
+@pytest.mark.parametrize("fl", (None, "id", "revision_id",))
 def test_search_datasets_by_full_slug_general_term(
     subtests,
     inc_sync_sensitive,
     base_url_3,
-    rsession,
-    random_pkg_slug,
-    variables
-):
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
-    response = rsession.get(
-        f"{base_url_3}/search/dataset?q={random_pkg_slug}&{limit_param}=100"
-    )
-    assert response.status_code == 200
-    rj = get_dataset_search_json_response(response, base_url_3, variables)
-
-    with subtests.test("response validity"):
-        validate_against_schema(rj, "search_dataset")
-        # check it's using the raw-string result format
-        if variables.get('ckan_version') == "2.9":
-            assert isinstance(rj["results"][0], dict)
-        else:
-            assert isinstance(rj["results"][0], str)
-        assert len(rj["results"]) <= 100
-
-    if inc_sync_sensitive:
-        with subtests.test("desired result present"):
-            results = [r["name"] for r in rj["results"]] if variables.get("ckan_version") == "2.9" else rj["results"]
-            desired_result = tuple(
-                name for name in results if name == random_pkg_slug
-            )
-            assert desired_result
-            if len(desired_result) > 1:
-                warn(f"Multiple results ({len(desired_result)}) with name = {random_pkg_slug!r})")
-
-
-def test_search_datasets_by_full_slug_general_term_id_response(
-    subtests,
-    inc_sync_sensitive,
-    base_url_3,
+    limit_offset_params,
     rsession,
     random_pkg,
+    fl,
     variables
 ):
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
+    if fl == "revision_id" and variables.get("ckan_version") == "2.9":
+        pytest.skip("revision_id is not available in 2.9")
+
+    limit_param, offset_param = limit_offset_params
+    fl_frag = f"&fl={fl}" if fl else ""
     response = rsession.get(
-        f"{base_url_3}/search/dataset?q={random_pkg['name']}&fl=id&{limit_param}=100"
+        f"{base_url_3}/search/dataset?q={random_pkg['name']}{fl_frag}&{limit_param}=100"
     )
     assert response.status_code == 200
     rj = get_dataset_search_json_response(response, base_url_3, variables)
 
     with subtests.test("response validity"):
         validate_against_schema(rj, "search_dataset")
-
-        if variables.get("ckan_version") == "2.9":
-            # in CKAN 2.9, v1 dataset search has been dropped so results come back as v3
+        if variables.get("ckan_version") == "2.9" or fl == "revision_id":
+            # in CKAN 2.9, v1 dataset search has been dropped so results come back as v3;
+            # choosing "revision_id" for the response also gets object-wrapped items
             assert isinstance(rj["results"][0], dict)
         else:
-            # when "id" is chosen for the response, it is presented as raw strings
+            # otherwise it's the raw-string result format
             assert isinstance(rj["results"][0], str)
         assert len(rj["results"]) <= 100
 
     if inc_sync_sensitive:
         with subtests.test("desired result present"):
-            if variables.get("ckan_version") == "2.9":
-                assert random_pkg["id"] in [r['id'] for r in rj["results"]]
+            field = fl or "name"
+            if isinstance(rj["results"][0], dict):
+                matching = sum(1 for dst in rj["results"] if dst[field] == random_pkg[field])
             else:
-                assert random_pkg["id"] in rj["results"]
-
-
-def test_search_datasets_by_full_slug_general_term_revision_id_response(
-    subtests,
-    inc_sync_sensitive,
-    base_url_3,
-    rsession,
-    random_pkg,
-    variables
-):
-    if variables.get("ckan_version") == "2.9":
-        pytest.skip("revision_id is not available in 2.9")
-
-    limit_param, offset_param = _get_limit_offset_params(base_url_3)
-    response = rsession.get(
-        f"{base_url_3}/search/dataset?q={random_pkg['name']}&fl=revision_id&{limit_param}=100"
-    )
-    assert response.status_code == 200
-    rj = response.json()
-
-    with subtests.test("response validity"):
-        validate_against_schema(rj, "search_dataset")
-        # when "revision_id" is chosen for the response, it is presented object-wrapped items
-        assert isinstance(rj["results"][0], dict)
-        assert len(rj["results"]) <= 100
-
-    if inc_sync_sensitive:
-        with subtests.test("desired result present"):
-            assert any(random_pkg["revision_id"] == dst["revision_id"] for dst in rj["results"])
+                matching = rj["results"].count(random_pkg[field])
+            assert matching
+            if field == "name" and matching > 1:
+                warn(f"Multiple results ({matching}) with name = {random_pkg['name']!r})")
 
 
 @pytest.mark.parametrize("allfields_term", ("all_fields=1", "fl=*",))
@@ -126,6 +71,7 @@ def test_search_datasets_by_full_slug_specific_field_all_fields_response(
     subtests,
     inc_sync_sensitive,
     base_url_3,
+    limit_offset_params,
     rsession,
     random_pkg,
     allfields_term,
@@ -134,7 +80,7 @@ def test_search_datasets_by_full_slug_specific_field_all_fields_response(
     if allfields_term.startswith("all_fields") and base_url_3.endswith("/3"):
         pytest.skip("all_fields parameter not supported in v3 endpoint")
 
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
+    limit_param, offset_param = limit_offset_params
     response = rsession.get(
         f"{base_url_3}/search/dataset?q=name:{random_pkg['name']}&{allfields_term}&{limit_param}=10"
     )
@@ -150,25 +96,27 @@ def test_search_datasets_by_full_slug_specific_field_all_fields_response(
 
     if inc_sync_sensitive:
         with subtests.test("desired result present"):
-            desired_result = tuple(
+            matches = (
                 dst for dst in rj["results"] if random_pkg["id"] == dst["id"]
             )
-            assert len(desired_result) == 1
+            desired_result = next(matches, None)
+            assert desired_result is not None
+            assert next(matches, None) is None
 
-            assert desired_result[0]["title"] == random_pkg["title"]
-            assert desired_result[0]["state"] == random_pkg["state"]
-            assert desired_result[0]["organization"] == random_pkg["organization"]["name"]
+            assert desired_result["title"] == random_pkg["title"]
+            assert desired_result["state"] == random_pkg["state"]
+            assert desired_result["organization"] == random_pkg["organization"]["name"]
 
 
 def test_search_datasets_stable_package_by_title_general_term(
     subtests,
     base_url_3,
+    limit_offset_params,
     rsession,
     stable_pkg,
     variables
 ):
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
-    name_terms = extract_search_terms(stable_pkg["name"], 3)
+    limit_param, offset_param = limit_offset_params
     response = rsession.get(
         f"{base_url_3}/search/dataset?q=name:{stable_pkg['name']}&fl=name&{limit_param}=100"
     )
@@ -187,16 +135,18 @@ def test_search_datasets_stable_package_by_title_general_term(
 
     with subtests.test("desired result present"):
         if variables.get("ckan_version") == "2.9":
-            assert stable_pkg["name"] in [n['name'] for n in rj["results"]]
+            assert stable_pkg["name"] in {n['name'] for n in rj["results"]}
         else:
             assert stable_pkg["name"] in rj["results"]
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize("org_as_q", (False, True,))
 def test_search_datasets_by_org_slug_specific_field_and_title_general_term(
     subtests,
     inc_sync_sensitive,
     base_url_3,
+    limit_offset_params,
     rsession,
     stable_pkg,
     org_as_q,
@@ -205,7 +155,7 @@ def test_search_datasets_by_org_slug_specific_field_and_title_general_term(
     if base_url_3.endswith("/3") and not org_as_q:
         pytest.skip("field filtering as separate params not supported in v3 endpoint")
 
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
+    limit_param, offset_param = limit_offset_params
     name_terms = "name:" + stable_pkg["name"]
 
     # it's possible to query specific fields in two different ways
@@ -224,11 +174,9 @@ def test_search_datasets_by_org_slug_specific_field_and_title_general_term(
     assert response.status_code == 200
     rj = get_dataset_search_json_response(response, base_url_3, variables=variables)
 
-    with subtests.test("response validity"):
-        validate_against_schema(rj, "search_dataset")
-        assert isinstance(rj["results"][0], dict)
-        assert len(rj["results"]) <= 1000
-
+    # checked before the schema validation: all() bails on the first offending result,
+    # so a criteria mismatch fails fast instead of after a full walk of a 1000-result
+    # document
     with subtests.test("all results match criteria"):
         assert all(
             stable_pkg["organization"]["name"] == dst["organization"]
@@ -237,23 +185,33 @@ def test_search_datasets_by_org_slug_specific_field_and_title_general_term(
         # we can't reliably test for the search terms because they may have been stemmed
         # and not correspond to exact matches
 
+    with subtests.test("response validity"):
+        validate_against_schema(rj, "search_dataset", sample_arrays=True)
+        assert isinstance(rj["results"][0], dict)
+        assert len(rj["results"]) <= 1000
+
     if inc_sync_sensitive:
         with subtests.test("desired result present"):
-            desired_result = tuple(
+            # a generator with next() rather than materializing a tuple of a 1000-result
+            # filter just to take its first (and, we assert, only) element
+            matches = (
                 dst for dst in rj["results"] if stable_pkg["id"] == dst["id"]
             )
-            if rj["count"] > 1000 and not desired_result:
+            desired_result = next(matches, None)
+            if rj["count"] > 1000 and desired_result is None:
                 # we don't have all results - it may well be on a latter page
                 warn(f"Expected dataset id {stable_pkg['id']!r} not found on first page of results")
             else:
-                assert len(desired_result) == 1
-                assert desired_result[0]["title"] == stable_pkg["title"]
+                assert desired_result is not None
+                assert next(matches, None) is None
+                assert desired_result["title"] == stable_pkg["title"]
 
 
 @pytest.mark.parametrize("allfields_term", ("all_fields=1", "fl=*",))
 def test_search_datasets_by_full_slug_specific_field_all_fields_response(
     subtests,
     base_url_3,
+    limit_offset_params,
     rsession,
     stable_dataset,
     allfields_term,
@@ -262,7 +220,7 @@ def test_search_datasets_by_full_slug_specific_field_all_fields_response(
     if allfields_term.startswith("all_fields") and (base_url_3.endswith("/3") or variables.get('ckan_version') == '2.9'):
         pytest.skip("all_fields parameter not supported in v3 endpoint")
 
-    limit_param, offset_param = _get_limit_offset_params(base_url_3, variables=variables)
+    limit_param, offset_param = limit_offset_params
 
     response = rsession.get(
         f"{base_url_3}/search/dataset?q=name:{stable_dataset['name']}"
@@ -279,12 +237,14 @@ def test_search_datasets_by_full_slug_specific_field_all_fields_response(
 
         _validate_embedded_keys(rj)
 
-    desired_result = tuple(
+    matches = (
         dst for dst in rj["results"] if stable_dataset["name"] == dst["name"]
     )
-    assert len(desired_result) == 1
+    desired_result = next(matches, None)
+    assert desired_result is not None
+    assert next(matches, None) is None
 
     with subtests.test("desired result equality"):
         clean_unstable_elements(stable_dataset, is_key_value=False)
-        clean_unstable_elements(desired_result[0], is_key_value=False)
-        assert desired_result[0] == AnySupersetOf(stable_dataset, recursive=True, seq_norm_order=True)
+        clean_unstable_elements(desired_result, is_key_value=False)
+        assert desired_result == AnySupersetOf(stable_dataset, recursive=True, seq_norm_order=True)